@@ -5,13 +5,15 @@ from fastapi.middleware.cors import CORSMiddleware
 import uuid
 
 
-from models.request_models import JobScraperPayload, ProfileUpdatePayload
+from models.request_models import JobScraperPayload, ProfileUpdatePayload, BatchProfileUpdatePayload
 from models.response_models import ScraperResponsePayload
 from handlers import (
     LinkedInScrapeActionsHandler,
     LinkedInProfileUpdateHandler,
+    LinkedInBatchProfileUpdateHandler,
     OtherDashboardsScrapeHandler,
 )
+from utils.duplicate_detector import save_duplicate_index
 
 app = FastAPI()
 app.secret_key = str(uuid.uuid4())
@@ -28,6 +30,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Persist near-duplicate index between restarts
+app.add_event_handler("shutdown", save_duplicate_index)
+
 
 def process_linkedin_search(request_payload: JobScraperPayload, user_id: str) -> None:
     """Process the LinkedIn search task in the background."""
@@ -44,6 +49,11 @@ def process_linkedin_profile_update(request_payload: ProfileUpdatePayload, user_
     handler = LinkedInProfileUpdateHandler(payload=request_payload, user_id=user_id)
     handler.process()
 
+def process_linkedin_batch_profile_update(request_payload: BatchProfileUpdatePayload, user_id: str) -> None:
+    """Process the LinkedIn profile update task for many users in the background."""
+    handler = LinkedInBatchProfileUpdateHandler(payload=request_payload, user_id=user_id)
+    handler.process()
+
 def process_other_dashboard_scraping(request_payload: JobScraperPayload, user_id: str) -> None:
     """Process the scraping task for other dashboards in the background."""
     handler = OtherDashboardsScrapeHandler(payload=request_payload, user_id=user_id)
@@ -72,4 +82,9 @@ async def initiate_other_dashboard_scraping(request_payload: JobScraperPayload,
 @app.post("/api/linkedin/refreshProfile", response_model=ScraperResponsePayload)
 async def initiate_linkedin_profile_update(request_payload: ProfileUpdatePayload, background_tasks: BackgroundTasks, userId: str = Header(...)):
     """Start the LinkedIn profile update task and return the initial processing result."""
-    return await initiate_task(request_payload, background_tasks, userId, process_linkedin_profile_update)
\ No newline at end of file
+    return await initiate_task(request_payload, background_tasks, userId, process_linkedin_profile_update)
+
+@app.post("/api/linkedin/refreshProfiles", response_model=ScraperResponsePayload)
+async def initiate_linkedin_batch_profile_update(request_payload: BatchProfileUpdatePayload, background_tasks: BackgroundTasks, userId: str = Header(...)):
+    """Start the LinkedIn profile update task for many users and return the initial processing result."""
+    return await initiate_task(request_payload, background_tasks, userId, process_linkedin_batch_profile_update)
\ No newline at end of file
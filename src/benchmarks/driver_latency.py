@@ -0,0 +1,69 @@
+"""
+Compare per-command latency of the WebDriver (Splinter) and DevTools Protocol browser backends.
+
+Run from the src directory:
+    python -m benchmarks.driver_latency --url https://www.linkedin.com/jobs/view/4018729848/ --css h1
+"""
+import argparse
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from utils.browser_provider import BrowserOptions, BrowserProvider, SupportedDriverEnum
+
+DEFAULT_USER_AGENT = (
+    "user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/130.0.0.0 Safari/537.36"
+)
+
+
+def time_command(command: Callable, iterations: int) -> List[float]:
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        command()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def benchmark_driver(driver_name: SupportedDriverEnum, url: str, css_selector: str, iterations: int) -> Dict[str, List[float]]:
+    browser_options = BrowserOptions(driverName=driver_name, userAgent=DEFAULT_USER_AGENT, headlessMode=True)
+    browser = BrowserProvider(browser_options=browser_options).browser
+    try:
+        browser.visit(url)
+        return {
+            "visit": time_command(lambda: browser.visit(url), max(1, iterations // 10)),
+            "url": time_command(lambda: browser.url, iterations),
+            "html": time_command(lambda: browser.html, iterations),
+            "find_by_css": time_command(lambda: browser.find_by_css(css_selector, wait_time=0), iterations),
+            "find_by_css.text": time_command(lambda: browser.find_by_css(css_selector, wait_time=0).first.text, iterations),
+            "find_by_xpath": time_command(lambda: browser.find_by_xpath("//body", wait_time=0), iterations),
+            "execute_script": time_command(lambda: browser.execute_script("window.scrollTo(0, 0)"), iterations),
+            "cookies": time_command(lambda: browser.cookies.all(verbose=True), iterations),
+        }
+    finally:
+        browser.quit()
+
+
+def print_report(driver_name: str, timings: Dict[str, List[float]]) -> None:
+    print(f"\n{driver_name}")
+    print(f"{'command':<20}{'p50 ms':>10}{'mean ms':>10}{'max ms':>10}")
+    for command, samples in timings.items():
+        print(f"{command:<20}{statistics.median(samples):>10.2f}{statistics.mean(samples):>10.2f}{max(samples):>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", required=True)
+    parser.add_argument("--css", default="body", help="CSS selector present on the page")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--drivers", nargs="+", default=[driver.value for driver in SupportedDriverEnum])
+    args = parser.parse_args()
+
+    for driver_name in args.drivers:
+        timings = benchmark_driver(SupportedDriverEnum(driver_name), args.url, args.css, args.iterations)
+        print_report(driver_name, timings)
+
+
+if __name__ == "__main__":
+    main()
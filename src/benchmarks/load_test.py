@@ -0,0 +1,280 @@
+"""
+Load test the scraper API against the simulated browser backend.
+
+Starts the API with SIMULATED_BROWSER enabled and a local callback sink, then for each concurrency
+level keeps that many requests in flight across the API endpoints. A request is complete when its
+first callback arrives. Reports throughput, p50/p95/p99 time to first result and peak API process RSS.
+
+Run from the src directory:
+    python -m benchmarks.load_test --concurrency 1 4 16 64 --requests-per-level 64
+
+Note: /api/other/scrape waits a fixed 30s per page in ArbitraryJobPostingScraper.
+"""
+import argparse
+import itertools
+import json
+import math
+import os
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+import requests
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BROWSER_OPTIONS = {
+    "driverName": "chrome",
+    "userAgent": "user-agent=Mozilla/5.0 (Simulated)",
+    "headlessMode": True,
+}
+USER_COOKIES = [{"name": "li_at", "value": "simulated", "domain": ".www.linkedin.com", "path": "/"}]
+
+ENDPOINT_PAYLOADS = {
+    "/api/linkedin/search": {
+        "jobDashboard": "LINKEDIN",
+        "action": "linkedin_job_search",
+        "authorizedUser": False,
+        "entryPoints": ["https://www.linkedin.com/jobs/search/?keywords=software%20engineer%20in%20test"],
+        "browserOptions": BROWSER_OPTIONS,
+        "userCookies": None,
+    },
+    "/api/linkedin/scrape": {
+        "jobDashboard": "LINKEDIN",
+        "action": "linkedin_job_details",
+        "authorizedUser": False,
+        "entryPoints": ["https://www.linkedin.com/jobs/view/4018729848/"],
+        "browserOptions": BROWSER_OPTIONS,
+        "userCookies": None,
+    },
+    "/api/other/scrape": {
+        "jobDashboard": "OTHER",
+        "action": "arbitrary_job_details",
+        "authorizedUser": False,
+        "entryPoints": ["https://example.com/careers/software-engineer"],
+        "browserOptions": BROWSER_OPTIONS,
+        "userCookies": None,
+    },
+    "/api/linkedin/refreshProfile": {
+        "userHeadline": "Simulated headline",
+        "browserOptions": BROWSER_OPTIONS,
+        "userCookies": USER_COOKIES,
+    },
+}
+
+
+class CallbackSink:
+    """Local HTTP server recording when the first callback for each userId arrives."""
+
+    def __init__(self, port: int):
+        self._first_results: Dict[str, float] = {}
+        self._events: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), self._build_handler())
+        self.url = f"http://127.0.0.1:{port}/callback"
+
+    def start(self) -> None:
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+
+    def expect(self, user_id: str) -> threading.Event:
+        with self._lock:
+            event = self._events[user_id] = threading.Event()
+            return event
+
+    def first_result_at(self, user_id: str) -> Optional[float]:
+        with self._lock:
+            return self._first_results.get(user_id)
+
+    def _record(self, user_id: str) -> None:
+        received_at = time.perf_counter()
+        with self._lock:
+            if user_id in self._first_results:
+                return
+            self._first_results[user_id] = received_at
+            event = self._events.get(user_id)
+        if event:
+            event.set()
+
+    def _build_handler(self):
+        sink = self
+
+        class CallbackHandler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                sink._record(self.headers.get("userId", ""))
+                self.send_response(200)
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        return CallbackHandler
+
+
+class MemorySampler:
+    """Tracks peak resident memory of a process from /proc (Linux only)."""
+
+    def __init__(self, pid: int, interval: float = 0.2):
+        self._pid = pid
+        self._interval = interval
+        self._stopped = threading.Event()
+        self._thread = None
+        self.peak_rss_mb = 0.0
+
+    def __enter__(self):
+        self.peak_rss_mb = self.read_rss_mb()
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stopped.set()
+        self._thread.join()
+
+    def read_rss_mb(self) -> float:
+        with open(f"/proc/{self._pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+        return 0.0
+
+    def _sample(self) -> None:
+        while not self._stopped.wait(self._interval):
+            self.peak_rss_mb = max(self.peak_rss_mb, self.read_rss_mb())
+
+
+def percentile(samples: List[float], percent: int) -> float:
+    if not samples:
+        return float("nan")
+    # Nearest-rank percentile
+    ordered = sorted(samples)
+    rank = max(0, math.ceil(percent * len(ordered) / 100) - 1)
+    return ordered[rank]
+
+
+def start_api_server(port: int, args) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        SIMULATED_BROWSER="true",
+        SIMULATED_BROWSER_PAGELATENCYMS=str(args.page_latency_ms),
+        SIMULATED_BROWSER_COMMANDLATENCYMS=str(args.command_latency_ms),
+        SIMULATED_BROWSER_RATELIMITRATIO=str(args.rate_limit_ratio),
+        SIMULATED_BROWSER_MEMORYFOOTPRINTMB=str(args.memory_footprint_mb),
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api:app", "--host", "127.0.0.1", "--port", str(port), "--workers", "1",
+         "--log-level", "warning"],
+        cwd=SRC_DIR,
+        env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            requests.get(f"http://127.0.0.1:{port}/docs", timeout=1)
+            return server
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("API server did not start within 30s")
+
+
+def send_request(base_url: str, endpoint: str, sink: CallbackSink, timeout: float) -> Optional[float]:
+    user_id = f"load-test-{uuid.uuid4()}"
+    first_result = sink.expect(user_id)
+    payload = dict(ENDPOINT_PAYLOADS[endpoint], callbackUrl=sink.url)
+    started = time.perf_counter()
+    try:
+        response = requests.post(f"{base_url}{endpoint}", headers={"userId": user_id}, json=payload, timeout=timeout)
+    except requests.RequestException:
+        # Refused connections and timeouts count as failed requests
+        return None
+    if response.status_code != 200 or not first_result.wait(timeout):
+        return None
+    return sink.first_result_at(user_id) - started
+
+
+def run_level(base_url: str, endpoints: List[str], sink: CallbackSink, memory: MemorySampler,
+              concurrency: int, total_requests: int, timeout: float) -> dict:
+    endpoint_cycle = list(itertools.islice(itertools.cycle(endpoints), total_requests))
+    with memory, ThreadPoolExecutor(max_workers=concurrency) as executor:
+        started = time.perf_counter()
+        results = list(executor.map(lambda endpoint: send_request(base_url, endpoint, sink, timeout), endpoint_cycle))
+        elapsed = time.perf_counter() - started
+
+    by_endpoint = {endpoint: [] for endpoint in endpoints}
+    for endpoint, result in zip(endpoint_cycle, results):
+        if result is not None:
+            by_endpoint[endpoint].append(result)
+    completed = [result for result in results if result is not None]
+    return {
+        "concurrency": concurrency,
+        "completed": len(completed),
+        "failed": len(results) - len(completed),
+        "throughput": len(completed) / elapsed,
+        "ttfr": completed,
+        "ttfr_by_endpoint": by_endpoint,
+        "peak_rss_mb": memory.peak_rss_mb,
+    }
+
+
+def print_level_report(report: dict) -> None:
+    print(
+        f"\nconcurrency={report['concurrency']} completed={report['completed']} failed={report['failed']} "
+        f"throughput={report['throughput']:.2f} results/s peak_rss={report['peak_rss_mb']:.1f} MB"
+    )
+    print(f"{'endpoint':<32}{'n':>5}{'p50 s':>10}{'p95 s':>10}{'p99 s':>10}")
+    rows = dict(report["ttfr_by_endpoint"], all=report["ttfr"])
+    for endpoint, samples in rows.items():
+        print(
+            f"{endpoint:<32}{len(samples):>5}{percentile(samples, 50):>10.2f}"
+            f"{percentile(samples, 95):>10.2f}{percentile(samples, 99):>10.2f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--requests-per-level", type=int, default=32)
+    parser.add_argument("--endpoints", nargs="+", default=list(ENDPOINT_PAYLOADS))
+    parser.add_argument("--api-port", type=int, default=8090)
+    parser.add_argument("--sink-port", type=int, default=8091)
+    parser.add_argument("--timeout", type=float, default=180)
+    parser.add_argument("--page-latency-ms", type=int, default=500)
+    parser.add_argument("--command-latency-ms", type=int, default=5)
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.0)
+    parser.add_argument("--memory-footprint-mb", type=int, default=0)
+    parser.add_argument("--json", help="Also write the reports to this file")
+    args = parser.parse_args()
+
+    sink = CallbackSink(args.sink_port)
+    sink.start()
+    server = start_api_server(args.api_port, args)
+    base_url = f"http://127.0.0.1:{args.api_port}"
+    memory = MemorySampler(server.pid)
+    reports = []
+    try:
+        for concurrency in args.concurrency:
+            report = run_level(base_url, args.endpoints, sink, memory, concurrency, args.requests_per_level, args.timeout)
+            print_level_report(report)
+            reports.append(report)
+    finally:
+        server.terminate()
+        server.wait()
+        sink.stop()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(reports, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,11 @@
 import logging
+import re
 import sys
 import time
+from typing import Optional
 
 from models.response_models import JobDetails
+from utils.snapshot_archive import SnapshotArchive
 
 
 logging.basicConfig(
@@ -13,8 +16,20 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def archive_page_snapshot(browser, snapshot_archive: Optional[SnapshotArchive], job_id: str, url: str,
+                          dashboard: str, authorized_user: bool = False) -> None:
+    if snapshot_archive is None:
+        return
+    try:
+        snapshot_archive.store(job_id=job_id, url=url, html=browser.html, dashboard=dashboard,
+                               authorized_user=authorized_user)
+    except Exception as e:
+        logger.warning(f"Unable to archive page snapshot of {url}: {e}")
+
+
 class LinkedInJobPostingScraper:
     LINKEDIN_JOB_URL = 'https://www.linkedin.com/jobs/view'
+    JOB_ID_PATTERN = re.compile(r'/jobs/view/(?:[^/?]*-)?(\d+)')
     CSS_SELECTORS = {
         "show_more": '[data-tracking-control-name="public_jobs_show-more-html-btn"]',
         "position": '[class="top-card-layout__title font-sans text-lg papabear:text-xl font-bold leading-open text-color-text mb-0 topcard__title"]',
@@ -29,19 +44,30 @@ class LinkedInJobPostingScraper:
         "position_from_card": '[class="t-24 job-details-jobs-unified-top-card__job-title"]',
     }
 
-    def __init__(self, browser, wait_time: int = 5):
+    def __init__(self, browser, wait_time: int = 5, snapshot_archive: Optional[SnapshotArchive] = None):
         self.job_details = None
         self.browser = browser
         self.wait_time = wait_time
+        self.snapshot_archive = snapshot_archive
 
     def fetch_linkedin_job_details(self, entry_point: str, is_authorized_user=True)->JobDetails:
-        self.job_details = JobDetails(url=entry_point)
+        self.job_details = JobDetails(id=self.extract_job_id(entry_point), url=entry_point)
         self._navigate_to_job_page(url=entry_point)
-        self._expand_job_details(is_authorized_user)
+        try:
+            self._expand_job_details(is_authorized_user)
+        finally:
+            # Archive even when expanding fails, changed selectors are what snapshots are for
+            archive_page_snapshot(self.browser, self.snapshot_archive, self.job_details.id or entry_point,
+                                  entry_point, "LINKEDIN", is_authorized_user)
         self._extract_job_details(is_authorized_user)
         logger.info(f"Retrieved LinkedIn job details: {self.job_details.position}@{self.job_details.companyName}")
         return self.job_details
 
+    @classmethod
+    def extract_job_id(cls, url: str) -> Optional[str]:
+        match = cls.JOB_ID_PATTERN.search(url)
+        return match.group(1) if match else None
+
     def _navigate_to_job_page(self, url):
         self.browser.visit(url)
 
@@ -93,14 +119,16 @@ class ArbitraryJobPostingScraper:
 
     JOB_DESCRIPTION_LIMIT = 16000
 
-    def __init__(self, browser, wait_time: int = 5):
+    def __init__(self, browser, wait_time: int = 5, snapshot_archive: Optional[SnapshotArchive] = None):
         self.browser = browser
         self.wait_time = wait_time
+        self.snapshot_archive = snapshot_archive
 
     def fetch_arbitrary_job_details(self, entry_point: str)->JobDetails:
         self.browser.visit(entry_point)
         time.sleep(self.wait_time)
         logger.info(f"Visiting arbitrary url: {entry_point}. Current url: {self.browser.url}")
+        archive_page_snapshot(self.browser, self.snapshot_archive, entry_point, entry_point, "OTHER")
         raw_details = self._get_raw_job_text()
         logger.info(f"Retrieved arbitrary job details: {entry_point} of size {len(raw_details)}")
         return JobDetails(url=entry_point, rawJobDescription=raw_details)
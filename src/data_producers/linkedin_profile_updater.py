@@ -1,6 +1,7 @@
 import logging
 import sys
-import time
+import threading
+from typing import Dict, Optional
 
 logging.basicConfig(
     level=logging.INFO,
@@ -11,18 +12,9 @@ logger = logging.getLogger(__name__)
 
 
 class LinkedInProfileUpdater:
-    LINKEDIN_FEED_URL = "https://www.linkedin.com/feed/"
-
-    # Main Page locators
-    VIEW_PROFILE_PARTIAL_LINK = "View Profile"
-    PROFILE_LINK_CSS = (
-        '[class="global-nav__primary-link '
-        'global-nav__primary-link-me-menu-trigger '
-        'artdeco-dropdown__trigger '
-        'artdeco-dropdown__trigger--placement-bottom ember-view"]'
-    )
-    CLOSE_SIGN_IN_MODAL_CSS = '[aria-label="Dismiss"]'
-    CLOSE_SIGN_IN_MODAL_XPATH = "(//svg)[1]"
+    # LinkedIn redirects /in/me/ to the canonical profile url of the authorized user
+    LINKEDIN_OWN_PROFILE_URL = "https://www.linkedin.com/in/me/"
+    LINKEDIN_PROFILE_URL_PREFIX = "https://www.linkedin.com/in/"
 
     # User profile locators
     HEADLINE_TEXT_INPUT_CSS = '[class="text-body-medium break-words"]'
@@ -33,43 +25,89 @@ class LinkedInProfileUpdater:
         'artdeco-text-input__textarea '
         'artdeco-text-input__textarea--align-top"]'
     )
+    EDITABLE_FIRST_NAME_CSS = 'input[id$="-firstName"]'
+    EDITABLE_LAST_NAME_CSS = 'input[id$="-lastName"]'
     SAVE_PROFILE_CSS = '[data-view-name="profile-form-save"]'
     CLOSE_SAVE_PROFILE_CSS = '[data-test-icon="close-medium"]'
-    UPDATED_PROFILE_CSS = '[class="text-body-medium break-words"]'
 
-    def __init__(self, browser, wait_time: int = 5):
+    # Intro form field name -> input locator
+    EDITABLE_FIELDS_CSS = {
+        "headline": EDITABLE_HEADLINE_CSS,
+        "firstName": EDITABLE_FIRST_NAME_CSS,
+        "lastName": EDITABLE_LAST_NAME_CSS,
+    }
+
+    # Canonical profile urls by user id, shared between requests
+    _profile_urls: Dict[str, str] = {}
+    _profile_urls_lock = threading.Lock()
+
+    def __init__(self, browser, wait_time: int = 5, user_id: Optional[str] = None):
         self.browser = browser
         self.wait_time = wait_time
+        self.user_id = user_id
 
     def update_headline(self, new_headline) -> None:
+        self.update_profile({"headline": new_headline})
+
+    def update_profile(self, profile_fields: Dict[str, str]) -> None:
+        profile_fields = {name: value for name, value in profile_fields.items() if value is not None}
+        unsupported_fields = set(profile_fields) - set(self.EDITABLE_FIELDS_CSS)
+        if unsupported_fields:
+            raise RuntimeError(f"Not supported profile fields: {sorted(unsupported_fields)}")
+        if not profile_fields:
+            raise RuntimeError("No profile fields to update")
+
         self._navigate_to_profile()
         current_headline = self._get_current_headline()
-        self._edit_headline(new_headline)
+        self._open_intro_form()
+        for field_name, value in profile_fields.items():
+            self._fill_field(field_name, value)
         self._save_profile()
         self._close_save_profile()
-        updated_headline = self._get_updated_headline()
-        logger.info(f"Updated headline from: {current_headline} to: {updated_headline}")
-
+        logger.info(f"Updated profile {self.browser.url} from headline: {current_headline} with: {profile_fields}")
 
     def _navigate_to_profile(self) -> None:
-        self.browser.visit(self.LINKEDIN_FEED_URL)
-        self.browser.find_by_css(self.PROFILE_LINK_CSS).click()
-        time.sleep(self.wait_time)
-        self.browser.links.find_by_partial_text(self.VIEW_PROFILE_PARTIAL_LINK).click()
+        cached_profile_url = self._get_cached_profile_url()
+        if cached_profile_url:
+            self.browser.visit(cached_profile_url)
+            if self.browser.url.startswith(cached_profile_url):
+                return
+            logger.info(f"Cached profile url {cached_profile_url} redirected to {self.browser.url}, resolving again")
+
+        self.browser.visit(self.LINKEDIN_OWN_PROFILE_URL)
+        profile_url = self.browser.url
+        if not profile_url.startswith(self.LINKEDIN_PROFILE_URL_PREFIX):
+            raise RuntimeError(f"Unable to navigate to user profile, current url: {profile_url}")
+        self._cache_profile_url(profile_url)
+
+    def _get_cached_profile_url(self) -> Optional[str]:
+        if self.user_id is None:
+            return None
+        with self._profile_urls_lock:
+            return self._profile_urls.get(self.user_id)
+
+    def _cache_profile_url(self, profile_url: str) -> None:
+        if self.user_id is None:
+            return
+        with self._profile_urls_lock:
+            self._profile_urls[self.user_id] = profile_url.split("?")[0]
 
     def _get_current_headline(self) -> str:
         return self.browser.find_by_css(self.HEADLINE_TEXT_INPUT_CSS, wait_time=self.wait_time).first.text
 
-    def _edit_headline(self, new_headline) -> None:
-        self.browser.find_by_css(self.EDIT_HEADLINE_CSS).click()
-        self.browser.find_by_css(self.EDITABLE_HEADLINE_CSS, wait_time=self.wait_time).fill(new_headline)
+    def _open_intro_form(self) -> None:
+        self.browser.find_by_css(self.EDIT_HEADLINE_CSS, wait_time=self.wait_time).click()
+
+    def _fill_field(self, field_name: str, value: str) -> None:
+        self.browser.find_by_css(self.EDITABLE_FIELDS_CSS[field_name], wait_time=self.wait_time).fill(value)
 
     def _save_profile(self) -> None:
         self.browser.find_by_css(self.SAVE_PROFILE_CSS).click()
-        time.sleep(self.wait_time)
+        if not self.browser.is_element_not_present_by_css(self.SAVE_PROFILE_CSS, wait_time=self.wait_time):
+            raise RuntimeError("Profile form was not saved, save button is still visible")
 
     def _close_save_profile(self) -> None:
-        self.browser.find_by_css(self.CLOSE_SAVE_PROFILE_CSS).click()
-
-    def _get_updated_headline(self) -> str:
-        return self.browser.find_by_css(self.UPDATED_PROFILE_CSS, wait_time=self.wait_time).first.text
+        # LinkedIn may offer to share the profile update, dismiss it when it shows up
+        close_buttons = self.browser.find_by_css(self.CLOSE_SAVE_PROFILE_CSS, wait_time=1)
+        if not close_buttons.is_empty():
+            close_buttons.first.click()
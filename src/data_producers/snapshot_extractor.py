@@ -0,0 +1,164 @@
+"""
+Re-run job field extractors over archived page snapshots, without a browser.
+
+Run from the src directory:
+    python -m data_producers.snapshot_extractor --archive-dir /data/snapshots --output job_details.jsonl
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import lxml.html
+from lxml.cssselect import CSSSelector
+
+from data_producers.job_details import LinkedInJobPostingScraper, ArbitraryJobPostingScraper
+from models.response_models import JobDetails
+from utils.snapshot_archive import SnapshotArchive, SnapshotEntry
+
+logger = logging.getLogger(__name__)
+
+NON_VISIBLE_TAGS = ("script", "style", "noscript", "template")
+# Elements rendered on their own line by innerText
+LINE_BREAK_TAGS = ("br", "p", "div", "li", "ul", "ol", "section", "article", "tr", "h1", "h2", "h3", "h4", "h5", "h6")
+
+
+@lru_cache(maxsize=None)
+def _css_selector(css: str) -> CSSSelector:
+    return CSSSelector(css)
+
+
+@lru_cache(maxsize=None)
+def _snapshot_archive(root_dir: str) -> SnapshotArchive:
+    return SnapshotArchive(root_dir)
+
+
+def _visible_text(element) -> str:
+    """Approximate innerText of the element, normalizes its subtree in place."""
+    for hidden in list(element.iter(*NON_VISIBLE_TAGS)):
+        hidden.drop_tree()
+    for block in element.iter(*LINE_BREAK_TAGS):
+        block.text = "\n" + (block.text or "")
+        block.tail = "\n" + (block.tail or "")
+    lines = (line.strip() for line in element.text_content().splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def _parse_html(html: str):
+    # Only the subtrees extractors read are normalized, see _visible_text
+    return lxml.html.document_fromstring(html)
+
+
+class LinkedInJobPostingHtmlExtractor:
+    """
+    Offline counterpart of LinkedInJobPostingScraper, reads the same CSS_SELECTORS from page HTML.
+    """
+
+    CSS_SELECTORS = LinkedInJobPostingScraper.CSS_SELECTORS
+
+    def __init__(self, html: str):
+        self.document = _parse_html(html)
+
+    def extract(self, job_details: JobDetails, is_authorized_user: bool) -> JobDetails:
+        if is_authorized_user:
+            job_details.rawJobDescription = self._get_text(self.CSS_SELECTORS["job_details_authorized"])
+            job_details.companyName = self._get_text(self.CSS_SELECTORS["company_from_card"])
+            job_details.position = self._get_text(self.CSS_SELECTORS["position_from_card"])
+        else:
+            job_details.rawJobDescription = self._get_text(self.CSS_SELECTORS["job_details_incognito"])
+            job_details.companyName = self._get_text(self.CSS_SELECTORS["company"])
+            job_details.position = self._get_text(self.CSS_SELECTORS["position"])
+        return job_details
+
+    def _get_text(self, css: str) -> Optional[str]:
+        elements = _css_selector(css)(self.document)
+        return _visible_text(elements[0]) if elements else None
+
+
+class ArbitraryJobPostingHtmlExtractor:
+    """
+    Offline counterpart of ArbitraryJobPostingScraper.
+    """
+
+    JOB_DESCRIPTION_LIMIT = ArbitraryJobPostingScraper.JOB_DESCRIPTION_LIMIT
+
+    def __init__(self, html: str):
+        self.document = _parse_html(html)
+
+    def extract(self, job_details: JobDetails) -> JobDetails:
+        body = self.document.find("body")
+        raw_text = _visible_text(body if body is not None else self.document)
+        job_details.rawJobDescription = raw_text[:self.JOB_DESCRIPTION_LIMIT]
+        return job_details
+
+
+def extract_snapshot(task: Tuple[str, Dict]) -> Dict:
+    """Return extracted JobDetails fields, or an "error" marker so one bad snapshot does not stop the run."""
+    root_dir, entry_fields = task
+    try:
+        entry = SnapshotEntry(**entry_fields)
+        html = _snapshot_archive(root_dir).load(entry.digest)
+        job_details = JobDetails(url=entry.url)
+
+        if entry.dashboard == "OTHER":
+            ArbitraryJobPostingHtmlExtractor(html).extract(job_details)
+        else:
+            job_details.id = entry.jobId
+            LinkedInJobPostingHtmlExtractor(html).extract(job_details, entry.authorizedUser)
+        return job_details.model_dump()
+    except Exception as e:
+        return {
+            "error": f"{type(e).__name__}: {e}",
+            "jobId": entry_fields.get("jobId"),
+            "digest": entry_fields.get("digest"),
+        }
+
+
+def reextract_archive(root_dir: str, output, workers: Optional[int] = None, chunk_size: int = 64) -> int:
+    archive = SnapshotArchive(root_dir)
+    tasks = [(root_dir, entry.model_dump()) for entry in archive.latest_entries().values()]
+    started, failed = time.perf_counter(), 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for result in executor.map(extract_snapshot, tasks, chunksize=chunk_size):
+            if "error" in result:
+                failed += 1
+                logger.error(f"Unable to re-extract job {result['jobId']} from snapshot {result['digest']}: {result['error']}")
+                continue
+            output.write(json.dumps(result) + "\n")
+    elapsed = time.perf_counter() - started
+    extracted = len(tasks) - failed
+    logger.info(
+        f"Re-extracted {extracted} snapshots, {failed} failed, in {elapsed:.2f}s ({len(tasks) / max(elapsed, 1e-9):.0f} pages/s)"
+    )
+    return extracted
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--archive-dir", default=os.getenv("SNAPSHOT_ARCHIVE_DIR"), required=not os.getenv("SNAPSHOT_ARCHIVE_DIR"))
+    parser.add_argument("--output", help="JSON lines file with JobDetails, stdout by default")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size, CPU count by default")
+    parser.add_argument("--chunk-size", type=int, default=64)
+    args = parser.parse_args()
+
+    # Keep stdout for extracted JobDetails
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[logging.StreamHandler(sys.stderr)],
+        force=True,
+    )
+    if args.output:
+        with open(args.output, "w") as output:
+            reextract_archive(args.archive_dir, output, args.workers, args.chunk_size)
+    else:
+        reextract_archive(args.archive_dir, sys.stdout, args.workers, args.chunk_size)
+
+
+if __name__ == "__main__":
+    main()
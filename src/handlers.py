@@ -1,20 +1,26 @@
+import logging
 import time
-from typing import List, Dict, Callable
+from typing import List, Dict, Callable, Optional
 
 import requests
 
-from models.request_models import ActionEnum
+from models.request_models import ActionEnum, UserProfileUpdate
 
 from models.response_models import (
     SearchResults,
     DetailsResults,
     JobDetails,
+    ScraperResponsePayload,
 )
 
 from data_producers.linkedin_job_search import LinkedInJobSearchScraper
 from data_producers.job_details import LinkedInJobPostingScraper, ArbitraryJobPostingScraper
 from data_producers.linkedin_profile_updater import LinkedInProfileUpdater
 from utils.browser_authorizer import LinkedInAuthorizer, OtherDashboardAuthorizer
+from utils.snapshot_archive import SnapshotArchive
+from utils.duplicate_detector import DuplicatePolicyEnum, get_duplicate_index
+
+logger = logging.getLogger(__name__)
 
 
 class BaseScrapeHandler:
@@ -40,6 +46,23 @@ class BaseScrapeHandler:
             except Exception as e:
                 print(f"Error while quitting the browser: {e}")
 
+    def _deduplicate(self, job_details: JobDetails) -> Optional[JobDetails]:
+        """Flag near-duplicates of postings recently delivered to this user, or drop them when the policy is to suppress."""
+        try:
+            duplicate_index = get_duplicate_index()
+            if duplicate_index is None:
+                return job_details
+            duplicate_of = duplicate_index.check(job_details, user_id=self.user_id)
+        except Exception as e:
+            # Deduplication is optional post-processing, deliver the posting unflagged
+            logger.error(f"Unable to check job {job_details.url} for near-duplicates: {e}")
+            return job_details
+        job_details.duplicateOf = duplicate_of
+        if job_details.duplicateOf and duplicate_index.options.policy == DuplicatePolicyEnum.SUPPRESS:
+            logger.info(f"Suppressed job {job_details.url} as near-duplicate of {job_details.duplicateOf}")
+            return None
+        return job_details
+
     def _notify_completion(self, result) -> None:
         if self.payload.callbackUrl:
             payload = result.dict()
@@ -101,12 +124,15 @@ class LinkedInScrapeActionsHandler(BaseScrapeHandler):
 
     def _fetch_linkedin_job_details(self) -> None:
         browser = self._initialize_linkedin_browser()
-        job_details_scraper = LinkedInJobPostingScraper(browser=browser, wait_time=5)
+        job_details_scraper = LinkedInJobPostingScraper(
+            browser=browser, wait_time=5, snapshot_archive=SnapshotArchive.from_env()
+        )
 
         try:
             for entry_point in self.payload.entryPoints:
-                job_details = self._fetch_job_details(job_details_scraper, entry_point)
-                self._notify_completion(job_details)
+                job_details = self._deduplicate(self._fetch_job_details(job_details_scraper, entry_point))
+                if job_details:
+                    self._notify_completion(job_details)
         finally:
             self._cleanup_browser(browser)
 
@@ -144,14 +170,17 @@ class OtherDashboardsScrapeHandler(BaseScrapeHandler):
 
     def _fetch_arbitrary_job_details(self) -> List[JobDetails]:
         browser = self._initialize_other_dashboard_browser()
-        job_details_scraper = ArbitraryJobPostingScraper(browser=browser, wait_time=30)
+        job_details_scraper = ArbitraryJobPostingScraper(
+            browser=browser, wait_time=30, snapshot_archive=SnapshotArchive.from_env()
+        )
         job_details_list = []
 
         try:
             for entry_point in self.payload.entryPoints:
-                job_details = self._fetch_details(job_details_scraper, entry_point)
-                self._notify_completion(job_details)
-                job_details_list.append(job_details)
+                job_details = self._deduplicate(self._fetch_details(job_details_scraper, entry_point))
+                if job_details:
+                    self._notify_completion(job_details)
+                    job_details_list.append(job_details)
         finally:
             self._cleanup_browser(browser)
         return job_details_list
@@ -167,10 +196,52 @@ class LinkedInProfileUpdateHandler(BaseScrapeHandler):
     def _update_linkedin_user_profile(self) -> None:
         browser = self._initialize_linkedin_browser()
         try:
-            self._perform_headline_update(browser)
+            self._perform_profile_update(browser)
         finally:
             self._cleanup_browser(browser)
 
-    def _perform_headline_update(self, browser) -> None:
-        profile_updater = LinkedInProfileUpdater(browser=browser, wait_time=5)
-        profile_updater.update_headline(new_headline=self.payload.userHeadline)
+    def _perform_profile_update(self, browser) -> None:
+        profile_updater = LinkedInProfileUpdater(browser=browser, wait_time=5, user_id=self.user_id)
+        profile_updater.update_profile(profile_fields=self._collect_profile_fields(self.payload))
+        self._notify_completion(ScraperResponsePayload(response="profile updated"))
+
+    @staticmethod
+    def _collect_profile_fields(profile_update) -> Dict[str, str]:
+        profile_fields = profile_update.profileFields.dict(exclude_none=True) if profile_update.profileFields else {}
+        if profile_update.userHeadline is not None:
+            profile_fields["headline"] = profile_update.userHeadline
+        return profile_fields
+
+class LinkedInBatchProfileUpdateHandler(LinkedInProfileUpdateHandler):
+    """
+    Updates profiles of many users in a single browser, switching sessions by cookies.
+    """
+
+    def process(self):
+        return self._update_linkedin_user_profiles()
+
+    def _update_linkedin_user_profiles(self) -> None:
+        session = LinkedInAuthorizer(browser_options=self.payload.browserOptions)
+        try:
+            for profile_update in self.payload.profiles:
+                self._update_single_profile(session, profile_update)
+        finally:
+            self._cleanup_browser(session.browser)
+
+    def _update_single_profile(self, session: LinkedInAuthorizer, profile_update: UserProfileUpdate) -> None:
+        try:
+            browser = session.switch_authorized_user(cookies=profile_update.userCookies)
+            profile_updater = LinkedInProfileUpdater(browser=browser, wait_time=5, user_id=profile_update.userId)
+            profile_updater.update_profile(profile_fields=self._collect_profile_fields(profile_update))
+        except Exception as e:
+            logger.error(f"Unable to update profile of user {profile_update.userId}: {e}")
+            self._notify_batch_progress(f"profile update failed: {profile_update.userId}")
+        else:
+            self._notify_batch_progress(f"profile updated: {profile_update.userId}")
+
+    def _notify_batch_progress(self, response: str) -> None:
+        # A failing callback must not stop updates of the remaining users
+        try:
+            self._notify_completion(ScraperResponsePayload(response=response))
+        except Exception as e:
+            logger.error(f"Unable to notify batch progress '{response}': {e}")
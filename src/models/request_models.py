@@ -1,6 +1,6 @@
 from enum import Enum
 from typing import List, Union, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 
 from utils.browser_provider import BrowserOptions
 
@@ -32,8 +32,33 @@ class JobScraperPayload(BaseModel):
     userCookies: Optional[Union[List[UserCookie] | None]]
     callbackUrl: Optional[Union[str | None]]
 
-class ProfileUpdatePayload(BaseModel):
-    userHeadline: str
+class ProfileFields(BaseModel):
+    headline: Optional[str] = None
+    firstName: Optional[str] = None
+    lastName: Optional[str] = None
+
+class ProfileFieldsRequiredMixin:
+    @model_validator(mode="after")
+    def require_profile_fields(self):
+        if self.userHeadline is None and not (self.profileFields and self.profileFields.model_dump(exclude_none=True)):
+            raise ValueError("Either userHeadline or profileFields is required")
+        return self
+
+class ProfileUpdatePayload(ProfileFieldsRequiredMixin, BaseModel):
+    userHeadline: Optional[str] = None
+    profileFields: Optional[ProfileFields] = None
     browserOptions: BrowserOptions
     userCookies: Optional[Union[List[UserCookie] | None]]
     authorizedUser: bool = True
+    callbackUrl: Optional[str] = None
+
+class UserProfileUpdate(ProfileFieldsRequiredMixin, BaseModel):
+    userId: str
+    userHeadline: Optional[str] = None
+    profileFields: Optional[ProfileFields] = None
+    userCookies: List[UserCookie]
+
+class BatchProfileUpdatePayload(BaseModel):
+    browserOptions: BrowserOptions
+    profiles: List[UserProfileUpdate]
+    callbackUrl: Optional[str] = None
@@ -8,6 +8,7 @@ class JobDetails(BaseModel):
     rawJobDescription: Optional[str] = None
     companyName: Optional[str] = None
     position: Optional[str] = None
+    duplicateOf: Optional[str] = None
 
 class SearchResults(BaseModel):
     urls: Optional[List[Optional[str]]] = None
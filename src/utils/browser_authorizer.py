@@ -54,6 +54,12 @@ class LinkedInAuthorizer(AuthorizerBase):
         self.ensure_valid_url(target_url)
         return self.browser
 
+    def switch_authorized_user(self, cookies: List[UserCookie], target_url: str = LINKEDIN_AUTHORIZED_USER_REDIRECT_URL):
+        """Reuse the running browser for another user by replacing session cookies."""
+        self.validate_cookies(cookies)
+        self.browser.cookies.delete_all()
+        return self.start_authorized_session(cookies=cookies, target_url=target_url)
+
     @staticmethod
     def validate_cookies(cookies: List[UserCookie]):
         if not cookies:
@@ -65,20 +71,18 @@ class LinkedInAuthorizer(AuthorizerBase):
             self.refresh_browser()
 
     def get_existing_cookie_values(self):
-        webdriver = self.browser.driver
-        return {cookie.get("value") for cookie in webdriver.get_cookies()}
+        return {cookie.get("value") for cookie in self.browser.cookies.all(verbose=True)}
 
     def add_new_cookies(self, cookies: List[UserCookie], existing_cookie_values: set):
         new_cookies_added = False
-        webdriver = self.browser.driver
         for cookie in cookies:
             if cookie.value not in existing_cookie_values:
-                webdriver.add_cookie(cookie.dict())  # Convert from Pydantic
+                self.browser.cookies.add({cookie.name: cookie.value}, domain=cookie.domain, path=cookie.path)
                 new_cookies_added = True
         return new_cookies_added
 
     def refresh_browser(self):
-        self.browser.driver.refresh()
+        self.browser.reload()
 
     def ensure_valid_url(self, target_url: str):
         current_url = self.browser.url
@@ -3,9 +3,13 @@ from pydantic import BaseModel
 from selenium.webdriver import ChromeOptions
 from splinter import Browser
 
+from utils.cdp_browser import CdpBrowser
+from utils.simulated_browser import SimulatedBrowser, SimulatedBrowserOptions
+
 
 class SupportedDriverEnum(str, Enum):
     CHROME_DRIVER = "chrome"
+    CHROME_CDP = "chrome_cdp"
 
 
 class BrowserOptions(BaseModel):
@@ -27,13 +31,27 @@ class BrowserProvider:
         return self._browser_instance
 
     def _create_browser_instance(self):
+        if SimulatedBrowserOptions.is_enabled():
+            return SimulatedBrowser(options=SimulatedBrowserOptions.from_env())
         chrome_options = self._setup_chrome_options()
+        if self._browser_options.driverName == SupportedDriverEnum.CHROME_CDP:
+            return self._create_cdp_browser_instance(chrome_options)
         return Browser(
             self._browser_options.driverName,
             headless=self._browser_options.headlessMode,
             options=chrome_options,
         )
 
+    def _create_cdp_browser_instance(self, chrome_options):
+        # chromedriver prefixes bare switches with "--", do the same when launching Chrome directly
+        chrome_arguments = [
+            argument if argument.startswith("--") else f"--{argument}"
+            for argument in chrome_options.arguments
+        ]
+        return CdpBrowser(
+            chrome_arguments=chrome_arguments,
+            headless=self._browser_options.headlessMode,
+        )
 
     def _setup_chrome_options(self):
         options = ChromeOptions()
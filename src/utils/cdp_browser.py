@@ -0,0 +1,382 @@
+import itertools
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import time
+from typing import List, Optional
+
+import requests
+import websocket
+from splinter.element_list import ElementList
+
+logger = logging.getLogger(__name__)
+
+
+class CdpCommandError(RuntimeError):
+    pass
+
+
+class CdpConnection:
+    """
+    Minimal synchronous Chrome DevTools Protocol client over a page websocket.
+    No event domains are enabled, events received while waiting for a command reply are dropped.
+    """
+
+    def __init__(self, websocket_url: str, timeout: int = 30):
+        self._socket = websocket.create_connection(websocket_url, timeout=timeout, suppress_origin=True)
+        self._message_ids = itertools.count(1)
+
+    def send(self, method: str, **params) -> dict:
+        message_id = next(self._message_ids)
+        self._socket.send(json.dumps({"id": message_id, "method": method, "params": params}))
+        while True:
+            message = json.loads(self._socket.recv())
+            if message.get("id") != message_id:
+                continue
+            if "error" in message:
+                raise CdpCommandError(f"{method} failed: {message['error'].get('message')}")
+            return message.get("result", {})
+
+    def close(self) -> None:
+        try:
+            self._socket.close()
+        except Exception as e:
+            logger.warning(f"Error while closing CDP websocket: {e}")
+
+
+class CdpElement:
+    """
+    Remote DOM element handle, mirrors the parts of splinter's WebDriverElement used by scrapers.
+    Refers to an item of the remote result array of a query, so a query needs a single round trip.
+    """
+
+    def __init__(self, browser: "CdpBrowser", array_object_id: str, index: int):
+        self._browser = browser
+        self._array_object_id = array_object_id
+        self._index = index
+
+    @property
+    def text(self) -> str:
+        return self._call("function() { return this.innerText; }")
+
+    @property
+    def value(self) -> str:
+        return self._call("function() { return this.value; }")
+
+    @property
+    def html(self) -> str:
+        return self._call("function() { return this.innerHTML; }")
+
+    def __getitem__(self, attribute: str) -> Optional[str]:
+        return self._call("function(name) { return this.getAttribute(name); }", attribute)
+
+    def click(self) -> None:
+        self._call("function() { this.scrollIntoView({block: 'center'}); this.click(); }")
+
+    def fill(self, value: str) -> None:
+        self._call(
+            """
+            function(value) {
+                this.focus();
+                this.value = value;
+                this.dispatchEvent(new Event('input', {bubbles: true}));
+                this.dispatchEvent(new Event('change', {bubbles: true}));
+            }
+            """,
+            value,
+        )
+
+    def find_by_css(self, css_selector: str, wait_time: Optional[int] = None) -> ElementList:
+        return self._browser._find(CdpBrowser.CSS_QUERY_JS, css_selector, wait_time, "css", self)
+
+    def find_by_xpath(self, xpath: str, wait_time: Optional[int] = None) -> ElementList:
+        return self._browser._find(CdpBrowser.XPATH_QUERY_JS, xpath, wait_time, "xpath", self)
+
+    def _call(self, function_declaration: str, *args, return_by_value: bool = True):
+        # Apply the element function to this[index] of the result array
+        return self._browser._call_function_on(
+            self._array_object_id,
+            f"function(index, ...args) {{ return ({function_declaration}).apply(this[index], args); }}",
+            self._index,
+            *args,
+            return_by_value=return_by_value,
+        )
+
+
+class CdpCookieManager:
+    """
+    Cookie access compatible with splinter's CookieManager.
+    """
+
+    def __init__(self, connection: CdpConnection):
+        self._connection = connection
+
+    def add(self, cookie: dict, **kwargs) -> None:
+        for name, value in cookie.items():
+            self._connection.send("Network.setCookie", name=name, value=value, **kwargs)
+
+    def delete(self, *cookies) -> None:
+        existing_cookies = self.all(verbose=True)
+        for cookie in existing_cookies:
+            if cookie["name"] in cookies:
+                self._connection.send(
+                    "Network.deleteCookies", name=cookie["name"], domain=cookie["domain"], path=cookie["path"]
+                )
+
+    def delete_all(self) -> None:
+        self._connection.send("Network.clearBrowserCookies")
+
+    def all(self, verbose: bool = False):
+        cookies = self._connection.send("Network.getCookies").get("cookies", [])
+        if verbose:
+            return cookies
+        return {cookie["name"]: cookie["value"] for cookie in cookies}
+
+
+class CdpBrowser:
+    """
+    Browser talking to Chrome directly over the DevTools Protocol.
+    Implements the subset of splinter's Browser API used by scrapers and authorizers.
+    """
+
+    DEFAULT_WAIT_TIME = 2
+    POLL_INTERVAL = 0.1
+    ELEMENT_POLL_INTERVAL = 0.02
+    ARRAY_DESCRIPTION_PATTERN = re.compile(r"Array\((\d+)\)")
+    STARTUP_TIMEOUT = 30
+    PAGE_LOAD_TIMEOUT = 30
+    # Remote result arrays of element queries, released on navigation
+    ELEMENTS_OBJECT_GROUP = "cdp-browser-elements"
+    # Set on the current document before navigating, gone once the new document is loaded
+    NAVIGATION_MARKER = "__cdpBrowserNavigation"
+
+    # Queries return null rather than an empty array, so polling creates no remote objects
+    CSS_QUERY_JS = """
+    function(selector) {
+        const nodes = Array.from(this.querySelectorAll(selector));
+        return nodes.length ? nodes : null;
+    }
+    """
+    XPATH_QUERY_JS = """
+    function(xpath) {
+        const snapshot = document.evaluate(xpath, this, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        const nodes = [];
+        for (let i = 0; i < snapshot.snapshotLength; i++) {
+            nodes.push(snapshot.snapshotItem(i));
+        }
+        return nodes.length ? nodes : null;
+    }
+    """
+
+    def __init__(self, chrome_arguments: List[str], headless: bool = True, chrome_binary: Optional[str] = None):
+        self.wait_time = self.DEFAULT_WAIT_TIME
+        self._user_data_dir = tempfile.mkdtemp(prefix="cdp-chrome-")
+        self._process = None
+        try:
+            self._process = self._launch_chrome(
+                chrome_binary or os.getenv("CHROME_BINARY", "google-chrome"), chrome_arguments, headless
+            )
+            self._connection = CdpConnection(self._get_page_websocket_url(), timeout=self.PAGE_LOAD_TIMEOUT)
+        except Exception:
+            self.quit()
+            raise
+        self.cookies = CdpCookieManager(self._connection)
+
+    @property
+    def url(self) -> str:
+        return self.evaluate_script("window.location.href")
+
+    @property
+    def title(self) -> str:
+        return self.evaluate_script("document.title")
+
+    @property
+    def html(self) -> str:
+        return self.evaluate_script("document.documentElement.outerHTML")
+
+    def visit(self, url: str) -> None:
+        self._prepare_navigation()
+        result = self._connection.send("Page.navigate", url=url)
+        if result.get("errorText"):
+            raise CdpCommandError(f"Navigation to {url} failed: {result['errorText']}")
+        # Same-document navigations have no loader and keep the marked document
+        if result.get("loaderId"):
+            self._wait_for_page_load()
+
+    def reload(self) -> None:
+        self._prepare_navigation()
+        self._connection.send("Page.reload")
+        self._wait_for_page_load()
+
+    def execute_script(self, script: str):
+        return self._evaluate(script)
+
+    def evaluate_script(self, script: str):
+        return self._evaluate(script)
+
+    def find_by_css(self, css_selector: str, wait_time: Optional[int] = None) -> ElementList:
+        return self._find(self.CSS_QUERY_JS, css_selector, wait_time, "css")
+
+    def find_by_xpath(self, xpath: str, wait_time: Optional[int] = None) -> ElementList:
+        return self._find(self.XPATH_QUERY_JS, xpath, wait_time, "xpath")
+
+    def is_element_present_by_css(self, css_selector: str, wait_time: Optional[int] = None) -> bool:
+        return not self.find_by_css(css_selector, wait_time).is_empty()
+
+    def is_element_present_by_xpath(self, xpath: str, wait_time: Optional[int] = None) -> bool:
+        return not self.find_by_xpath(xpath, wait_time).is_empty()
+
+    def is_element_not_present_by_css(self, css_selector: str, wait_time: Optional[int] = None) -> bool:
+        return self._wait_until_absent(self.CSS_QUERY_JS, css_selector, wait_time)
+
+    def is_element_not_present_by_xpath(self, xpath: str, wait_time: Optional[int] = None) -> bool:
+        return self._wait_until_absent(self.XPATH_QUERY_JS, xpath, wait_time)
+
+    def quit(self) -> None:
+        connection = getattr(self, "_connection", None)
+        if connection:
+            try:
+                connection.send("Browser.close")
+            except Exception as e:
+                logger.warning(f"Error while closing CDP browser: {e}")
+            connection.close()
+        if self._process is not None:
+            self._process.terminate()
+            try:
+                self._process.wait(timeout=self.STARTUP_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                self._process.kill()
+        shutil.rmtree(self._user_data_dir, ignore_errors=True)
+
+    def _launch_chrome(self, chrome_binary: str, chrome_arguments: List[str], headless: bool) -> subprocess.Popen:
+        command = [
+            chrome_binary,
+            "--remote-debugging-port=0",
+            f"--user-data-dir={self._user_data_dir}",
+            "--no-first-run",
+            "--no-default-browser-check",
+            *chrome_arguments,
+        ]
+        if headless:
+            command.append("--headless=new")
+        command.append("about:blank")
+        return subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    def _get_page_websocket_url(self) -> str:
+        port = self._wait_for_debugging_port()
+        targets = requests.get(f"http://127.0.0.1:{port}/json/list", timeout=self.STARTUP_TIMEOUT).json()
+        for target in targets:
+            if target.get("type") == "page":
+                return target["webSocketDebuggerUrl"]
+        raise RuntimeError("Unable to find Chrome page target for DevTools Protocol session")
+
+    def _wait_for_debugging_port(self) -> str:
+        # Chrome writes the chosen port on the first line of DevToolsActivePort
+        port_file = os.path.join(self._user_data_dir, "DevToolsActivePort")
+        deadline = time.monotonic() + self.STARTUP_TIMEOUT
+        while time.monotonic() < deadline:
+            if self._process.poll() is not None:
+                raise RuntimeError(f"Chrome exited during startup with code {self._process.returncode}")
+            if os.path.exists(port_file):
+                with open(port_file) as f:
+                    port = f.readline().strip()
+                if port:
+                    return port
+            time.sleep(self.POLL_INTERVAL)
+        raise RuntimeError("Timed out waiting for Chrome DevTools Protocol endpoint")
+
+    def _prepare_navigation(self) -> None:
+        self._connection.send("Runtime.releaseObjectGroup", objectGroup=self.ELEMENTS_OBJECT_GROUP)
+        self._evaluate(f"window.{self.NAVIGATION_MARKER} = true")
+
+    def _wait_for_page_load(self) -> None:
+        # The old document is still "complete" right after navigating, wait for the marker to go away
+        expression = f"!window.{self.NAVIGATION_MARKER} && document.readyState === 'complete'"
+        deadline = time.monotonic() + self.PAGE_LOAD_TIMEOUT
+        while time.monotonic() < deadline:
+            try:
+                if self._evaluate(expression):
+                    return
+            except CdpCommandError as e:
+                # Execution context is destroyed while the document is being replaced
+                logger.debug(f"Page load check failed during navigation: {e}")
+            time.sleep(self.POLL_INTERVAL)
+        logger.warning(f"Page did not finish loading within {self.PAGE_LOAD_TIMEOUT}s: {self.url}")
+
+    def _evaluate(self, expression: str):
+        result = self._connection.send(
+            "Runtime.evaluate", expression=expression, returnByValue=True, awaitPromise=True
+        )
+        self._raise_on_exception(result)
+        return result.get("result", {}).get("value")
+
+    def _call_function_on(self, object_id: str, function_declaration: str, *args, return_by_value: bool = True):
+        result = self._connection.send(
+            "Runtime.callFunctionOn",
+            objectId=object_id,
+            functionDeclaration=function_declaration,
+            arguments=[{"value": arg} for arg in args],
+            returnByValue=return_by_value,
+            awaitPromise=True,
+        )
+        self._raise_on_exception(result)
+        if return_by_value:
+            return result.get("result", {}).get("value")
+        return result.get("result", {})
+
+    def _find(self, query_js: str, query: str, wait_time: Optional[int], find_by: str,
+              context: Optional[CdpElement] = None) -> ElementList:
+        wait_time = self.wait_time if wait_time is None else wait_time
+        deadline = time.monotonic() + wait_time
+        while True:
+            elements = self._query_elements(query_js, query, context)
+            if elements or time.monotonic() >= deadline:
+                return ElementList(elements, find_by=find_by, query=query)
+            time.sleep(self.ELEMENT_POLL_INTERVAL)
+
+    def _wait_until_absent(self, query_js: str, query: str, wait_time: Optional[int]) -> bool:
+        wait_time = self.wait_time if wait_time is None else wait_time
+        deadline = time.monotonic() + wait_time
+        # Only the presence is needed, check by value without keeping remote arrays
+        expression = f"({query_js}).call(document, {json.dumps(query)}) !== null"
+        while True:
+            if not self._evaluate(expression):
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(self.ELEMENT_POLL_INTERVAL)
+
+    def _query_elements(self, query_js: str, query: str, context: Optional[CdpElement]) -> List[CdpElement]:
+        # One round trip: the result array stays remote, elements refer to it by index.
+        # Context queries inherit the object group of the context array
+        if context is None:
+            result = self._connection.send(
+                "Runtime.evaluate",
+                expression=f"({query_js}).call(document, {json.dumps(query)})",
+                objectGroup=self.ELEMENTS_OBJECT_GROUP,
+            )
+            self._raise_on_exception(result)
+            array_object = result.get("result", {})
+        else:
+            array_object = context._call(query_js, query, return_by_value=False)
+        if not array_object.get("objectId"):
+            return []
+        return [CdpElement(self, array_object["objectId"], index) for index in range(self._array_length(array_object))]
+
+    def _array_length(self, array_object: dict) -> int:
+        # V8 describes arrays as "Array(<length>)"
+        match = self.ARRAY_DESCRIPTION_PATTERN.fullmatch(array_object.get("description", ""))
+        if match:
+            return int(match.group(1))
+        return self._call_function_on(array_object["objectId"], "function() { return this.length; }")
+
+    @staticmethod
+    def _raise_on_exception(result: dict) -> None:
+        exception_details = result.get("exceptionDetails")
+        if exception_details:
+            description = exception_details.get("exception", {}).get("description") or exception_details.get("text")
+            raise CdpCommandError(f"Script evaluation failed: {description}")
@@ -0,0 +1,397 @@
+"""
+Near-duplicate job posting detection with MinHash signatures and an LSH index.
+
+Seed the index from JobDetails json lines, e.g. snapshot_extractor output, run from the src directory:
+    python -m utils.duplicate_detector --index-path /data/duplicates.npz job_details.jsonl
+"""
+import argparse
+import io
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from enum import Enum
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from pydantic import BaseModel
+
+from models.response_models import JobDetails
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_DETECTION_ENV_PREFIX = "DUPLICATE_DETECTION_"
+
+
+class DuplicatePolicyEnum(str, Enum):
+    OFF = "off"
+    FLAG = "flag"
+    SUPPRESS = "suppress"
+
+
+class DuplicateDetectionOptions(BaseModel):
+    policy: DuplicatePolicyEnum = DuplicatePolicyEnum.OFF
+    threshold: float = 0.8
+    windowHours: float = 24 * 14
+    numPerm: int = 128
+    bands: int = 16
+    shingleSize: int = 5
+    indexPath: Optional[str] = None
+    saveIntervalSeconds: int = 300
+
+    @classmethod
+    def from_env(cls) -> "DuplicateDetectionOptions":
+        """Read options from DUPLICATE_DETECTION_<FIELD> env variables, e.g. DUPLICATE_DETECTION_POLICY."""
+        overrides = {}
+        for field_name in cls.model_fields:
+            value = os.getenv(f"{DUPLICATE_DETECTION_ENV_PREFIX}{field_name.upper()}")
+            if value is not None:
+                overrides[field_name] = value
+        return cls(**overrides)
+
+
+class MinHashFingerprinter:
+    """
+    MinHash signatures over word shingles, computed with numpy for whole batches of documents.
+    """
+
+    # Word bytes: ASCII letters, digits, underscore and any byte of a multi-byte UTF-8 character
+    WORD_BYTES = np.array([chr(byte).isalnum() or chr(byte) == "_" if byte < 128 else True for byte in range(256)])
+    # Odd multiplier, so powers have inverses modulo 2^64
+    TOKEN_HASH_BASE = 1099511628211
+    # Bounds the (shingles x permutations) matrix hashed at once, small enough to stay in CPU cache
+    MAX_SHINGLES_PER_CHUNK = 1 << 11
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 5, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hash family: ((a * x + b) mod 2^64) >> 32, a odd
+        self._a = rng.integers(0, np.iinfo(np.uint64).max, size=num_perm, dtype=np.uint64, endpoint=True) | np.uint64(1)
+        self._b = rng.integers(0, np.iinfo(np.uint64).max, size=num_perm, dtype=np.uint64, endpoint=True)
+        self._shingle_weights = rng.integers(0, np.iinfo(np.uint64).max, size=shingle_size, dtype=np.uint64,
+                                             endpoint=True) | np.uint64(1)
+        self._powers = np.ones(1, dtype=np.uint64)
+        self._inverse_powers = np.ones(1, dtype=np.uint64)
+
+    @staticmethod
+    def job_text(job_details: JobDetails) -> str:
+        return " ".join(filter(None, (job_details.companyName, job_details.position, job_details.rawJobDescription)))
+
+    def token_hashes(self, text: str) -> np.ndarray:
+        """Polynomial hashes of all words in the text, from prefix sums over its UTF-8 bytes."""
+        data = np.frombuffer(text.lower().encode("utf-8"), dtype=np.uint8)
+        powers, inverse_powers = self._get_powers(len(data))
+        is_word = np.concatenate(([False], self.WORD_BYTES[data], [False]))
+        edges = np.flatnonzero(is_word[1:] != is_word[:-1])
+        starts, ends = edges[::2], edges[1::2]
+        prefix_sums = np.zeros(len(data) + 1, dtype=np.uint64)
+        np.cumsum(data * powers[:len(data)], dtype=np.uint64, out=prefix_sums[1:])
+        return (prefix_sums[ends] - prefix_sums[starts]) * inverse_powers[starts]
+
+    def shingle_hashes(self, text: str) -> np.ndarray:
+        token_hashes = self.token_hashes(text)
+        if len(token_hashes) < self.shingle_size:
+            token_hashes = np.pad(token_hashes, (0, self.shingle_size - len(token_hashes)))
+        windows = np.lib.stride_tricks.sliding_window_view(token_hashes, self.shingle_size)
+        combined = (windows * self._shingle_weights).sum(axis=1, dtype=np.uint64)
+        return np.unique(combined >> np.uint64(32))
+
+    def signatures(self, texts: Sequence[str]) -> np.ndarray:
+        signatures = np.empty((len(texts), self.num_perm), dtype=np.uint32)
+        shingles = [self.shingle_hashes(text) for text in texts]
+        lengths = [len(document_shingles) for document_shingles in shingles]
+        chunks = self._chunks(lengths)
+        buffer = np.empty((max((sum(lengths[start:end]) for start, end in chunks), default=0), self.num_perm),
+                          dtype=np.uint64)
+        for start, end in chunks:
+            chunk_shingles = np.concatenate(shingles[start:end])
+            offsets = np.cumsum([0] + lengths[start:end - 1])
+            hashed = buffer[:len(chunk_shingles)]
+            np.multiply(chunk_shingles[:, None], self._a, out=hashed)
+            hashed += self._b
+            # The high 32 bits keep the ordering, so shift only the minimums
+            signatures[start:end] = np.minimum.reduceat(hashed, offsets, axis=0) >> np.uint64(32)
+        return signatures
+
+    def _get_powers(self, length: int) -> Tuple[np.ndarray, np.ndarray]:
+        powers, inverse_powers = self._powers, self._inverse_powers
+        if len(powers) < length:
+            size = max(length, 2 * len(powers))
+            multipliers = np.full(size, self.TOKEN_HASH_BASE, dtype=np.uint64)
+            inverse_multipliers = np.full(size, pow(self.TOKEN_HASH_BASE, -1, 1 << 64), dtype=np.uint64)
+            multipliers[0] = inverse_multipliers[0] = 1
+            powers, inverse_powers = np.cumprod(multipliers, dtype=np.uint64), np.cumprod(inverse_multipliers, dtype=np.uint64)
+            self._powers, self._inverse_powers = powers, inverse_powers
+        return powers, inverse_powers
+
+    def _chunks(self, lengths: List[int]) -> List[Tuple[int, int]]:
+        chunks, start, chunk_size = [], 0, 0
+        for index, length in enumerate(lengths):
+            if chunk_size and chunk_size + length > self.MAX_SHINGLES_PER_CHUNK:
+                chunks.append((start, index))
+                start, chunk_size = index, 0
+            chunk_size += length
+        if start < len(lengths):
+            chunks.append((start, len(lengths)))
+        return chunks
+
+
+class DuplicateIndex:
+    """
+    In-memory LSH index of MinHash signatures with a sliding time window, persisted as an npz file.
+    Thread safe, shared by background tasks of the service.
+
+    Signatures are shared by all users, but when checking for a user only postings already delivered to
+    that user count as duplicates, so one user's scrapes never hide postings from another.
+    """
+
+    def __init__(self, options: DuplicateDetectionOptions, fingerprinter: Optional[MinHashFingerprinter] = None):
+        if options.numPerm % options.bands:
+            raise RuntimeError(f"numPerm {options.numPerm} is not divisible by bands {options.bands}")
+        self.options = options
+        self.fingerprinter = fingerprinter or MinHashFingerprinter(options.numPerm, options.shingleSize)
+        self._rows = options.numPerm // options.bands
+        self._window_seconds = options.windowHours * 3600
+        self._buckets: List[Dict[bytes, Set[str]]] = [{} for _ in range(options.bands)]
+        # Insertion ordered, so the oldest entries are evicted first
+        self._entries: Dict[str, Tuple[np.ndarray, float]] = {}
+        # user id -> insertion ordered keys of postings delivered to the user, with delivery time
+        self._deliveries: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+        # Serializes writers of the index file, periodic saves run in background threads
+        self._save_lock = threading.Lock()
+        self._last_saved_at = time.monotonic()
+
+    def check(self, job_details: JobDetails, user_id: Optional[str] = None) -> Optional[str]:
+        return self.check_batch([job_details], user_id)[0]
+
+    def check_batch(self, job_details_list: Sequence[JobDetails], user_id: Optional[str] = None) -> List[Optional[str]]:
+        """
+        Return the key of an indexed near-duplicate for each posting, indexing postings that are new.
+        With a user_id only duplicates of postings already delivered to that user are returned,
+        and the postings are recorded as delivered to the user.
+        """
+        texts = [MinHashFingerprinter.job_text(job) for job in job_details_list]
+        signatures = self.fingerprinter.signatures(texts)
+        now = time.time()
+        with self._lock:
+            self._evict_expired(now)
+            deliveries = None
+            if user_id is not None:
+                self._evict_expired_deliveries(user_id, now)
+                deliveries = self._deliveries.setdefault(user_id, {})
+            duplicates = []
+            for job_details, text, signature in zip(job_details_list, texts, signatures):
+                if not text.strip():
+                    duplicates.append(None)
+                    continue
+                key = self.job_key(job_details)
+                duplicate_of = self._find_duplicate(key, signature)
+                if duplicate_of is None:
+                    self._add(key, signature, now)
+                if deliveries is not None:
+                    # Track the indexed posting the user has received, later duplicates match against it
+                    delivered_key = duplicate_of or key
+                    if duplicate_of not in deliveries:
+                        duplicate_of = None
+                    deliveries.pop(delivered_key, None)
+                    deliveries[delivered_key] = now
+                duplicates.append(duplicate_of)
+        self._save_if_due()
+        return duplicates
+
+    @staticmethod
+    def job_key(job_details: JobDetails) -> str:
+        return job_details.id or job_details.url
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def save(self, path: Optional[str] = None) -> None:
+        path = path or self.options.indexPath
+        if not path:
+            return
+        with self._save_lock:
+            with self._lock:
+                self._last_saved_at = time.monotonic()
+                # Users that stopped scraping are only evicted here and on load
+                now = time.time()
+                for user_id in list(self._deliveries):
+                    self._evict_expired_deliveries(user_id, now)
+                keys = list(self._entries)
+                signatures = np.array([self._entries[key][0] for key in keys], dtype=np.uint32).reshape(-1, self.options.numPerm)
+                indexed_at = np.array([self._entries[key][1] for key in keys], dtype=np.float64)
+                deliveries = [(user_id, key, delivered_at) for user_id, user_deliveries in self._deliveries.items()
+                              for key, delivered_at in user_deliveries.items()]
+            delivery_users, delivery_keys, delivered_at = zip(*deliveries) if deliveries else ((), (), ())
+            buffer = io.BytesIO()
+            np.savez_compressed(
+                buffer, keys=np.array(keys, dtype=str), signatures=signatures, indexed_at=indexed_at,
+                delivery_users=np.array(delivery_users, dtype=str), delivery_keys=np.array(delivery_keys, dtype=str),
+                delivered_at=np.array(delivered_at, dtype=np.float64),
+            )
+            self._write_index_file(path, buffer.getvalue())
+        logger.info(f"Saved duplicate index of {len(keys)} postings to {path}")
+
+    @staticmethod
+    def _write_index_file(path: str, content: bytes) -> None:
+        # Write to a unique temp file and rename so readers never see a partial index
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            os.replace(temp_path, path)
+        except Exception:
+            os.unlink(temp_path)
+            raise
+
+    def load(self, path: Optional[str] = None) -> None:
+        path = path or self.options.indexPath
+        if not path or not os.path.exists(path):
+            return
+        with np.load(path) as data:
+            keys, signatures, indexed_at = data["keys"], data["signatures"], data["indexed_at"]
+            # Index files saved before per-user deliveries were tracked have none
+            deliveries = zip(data["delivery_users"].tolist(), data["delivery_keys"].tolist(),
+                             data["delivered_at"].tolist()) if "delivery_users" in data else ()
+        if signatures.shape[1:] != (self.options.numPerm,):
+            raise RuntimeError(f"Duplicate index {path} has {signatures.shape[1]} permutations, expected {self.options.numPerm}")
+        with self._lock:
+            for key, signature, timestamp in zip(keys.tolist(), signatures, indexed_at.tolist()):
+                self._add(key, signature, timestamp)
+            for user_id, key, delivered_at in sorted(deliveries, key=lambda delivery: delivery[2]):
+                self._deliveries.setdefault(user_id, {})[key] = delivered_at
+            now = time.time()
+            self._evict_expired(now)
+            for user_id in list(self._deliveries):
+                self._evict_expired_deliveries(user_id, now)
+        logger.info(f"Loaded duplicate index of {len(self._entries)} postings from {path}")
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[band * self._rows:(band + 1) * self._rows].tobytes() for band in range(self.options.bands)]
+
+    def _find_duplicate(self, key: str, signature: np.ndarray) -> Optional[str]:
+        candidates = set()
+        for bucket, band_key in zip(self._buckets, self._band_keys(signature)):
+            candidates.update(bucket.get(band_key, ()))
+        candidates.discard(key)
+        best_key, best_similarity = None, self.options.threshold
+        for candidate in candidates:
+            similarity = float(np.mean(self._entries[candidate][0] == signature))
+            if similarity >= best_similarity:
+                best_key, best_similarity = candidate, similarity
+        return best_key
+
+    def _add(self, key: str, signature: np.ndarray, indexed_at: float) -> None:
+        self._remove(key)
+        # Rows of batch or loaded matrices are views, copy so the whole matrix is not kept alive
+        signature = signature.copy()
+        self._entries[key] = (signature, indexed_at)
+        for bucket, band_key in zip(self._buckets, self._band_keys(signature)):
+            bucket.setdefault(band_key, set()).add(key)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for bucket, band_key in zip(self._buckets, self._band_keys(entry[0])):
+            keys = bucket.get(band_key)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del bucket[band_key]
+
+    def _evict_expired(self, now: float) -> None:
+        expired_before = now - self._window_seconds
+        while self._entries:
+            oldest_key = next(iter(self._entries))
+            if self._entries[oldest_key][1] >= expired_before:
+                break
+            self._remove(oldest_key)
+
+    def _evict_expired_deliveries(self, user_id: str, now: float) -> None:
+        deliveries = self._deliveries.get(user_id)
+        if deliveries is None:
+            return
+        expired_before = now - self._window_seconds
+        while deliveries:
+            oldest_key = next(iter(deliveries))
+            if deliveries[oldest_key] >= expired_before:
+                break
+            del deliveries[oldest_key]
+        if not deliveries:
+            del self._deliveries[user_id]
+
+    def _save_if_due(self) -> None:
+        # Claim the save under the lock so concurrent checks start at most one, and keep it off the caller thread
+        with self._lock:
+            if not self.options.indexPath or time.monotonic() - self._last_saved_at < self.options.saveIntervalSeconds:
+                return
+            self._last_saved_at = time.monotonic()
+        threading.Thread(target=self._save_in_background, daemon=True).start()
+
+    def _save_in_background(self) -> None:
+        try:
+            self.save()
+        except Exception as e:
+            logger.error(f"Unable to save duplicate index to {self.options.indexPath}: {e}")
+
+
+_duplicate_index: Optional[DuplicateIndex] = None
+_duplicate_index_lock = threading.Lock()
+
+
+def get_duplicate_index() -> Optional[DuplicateIndex]:
+    """Shared index configured from env variables, None when duplicate detection is off."""
+    global _duplicate_index
+    with _duplicate_index_lock:
+        if _duplicate_index is None:
+            options = DuplicateDetectionOptions.from_env()
+            if options.policy == DuplicatePolicyEnum.OFF:
+                return None
+            _duplicate_index = DuplicateIndex(options)
+            _duplicate_index.load()
+        return _duplicate_index
+
+
+def save_duplicate_index() -> None:
+    if _duplicate_index is not None:
+        _duplicate_index.save()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("inputs", nargs="+", help="JobDetails json lines files")
+    parser.add_argument("--index-path", required=True)
+    parser.add_argument("--batch-size", type=int, default=4096)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    options = DuplicateDetectionOptions.from_env()
+    options.indexPath = args.index_path
+    index = DuplicateIndex(options)
+    index.load()
+
+    started, total, duplicates = time.perf_counter(), 0, 0
+    batch: List[JobDetails] = []
+    for input_path in args.inputs:
+        with open(input_path) as f:
+            for line in f:
+                if line.strip():
+                    batch.append(JobDetails(**json.loads(line)))
+                if len(batch) >= args.batch_size:
+                    duplicates += sum(duplicate is not None for duplicate in index.check_batch(batch))
+                    total, batch = total + len(batch), []
+    if batch:
+        duplicates += sum(duplicate is not None for duplicate in index.check_batch(batch))
+        total += len(batch)
+    elapsed = time.perf_counter() - started
+    logger.info(f"Fingerprinted {total} postings in {elapsed:.2f}s, {duplicates} near-duplicates")
+    index.save()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+import os
+import random
+import re
+import time
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from pydantic import BaseModel
+from splinter.element_list import ElementList
+
+SIMULATED_BROWSER_ENV_PREFIX = "SIMULATED_BROWSER_"
+
+
+class SimulatedBrowserOptions(BaseModel):
+    pageLatencyMs: int = 500
+    commandLatencyMs: int = 5
+    rateLimitRatio: float = 0.0
+    memoryFootprintMb: int = 0
+    jobsPerPage: int = 7
+    searchPages: int = 3
+
+    @staticmethod
+    def is_enabled() -> bool:
+        return os.getenv("SIMULATED_BROWSER", "").lower() in ("1", "true", "yes")
+
+    @classmethod
+    def from_env(cls) -> "SimulatedBrowserOptions":
+        """Read options from SIMULATED_BROWSER_<FIELD> env variables, e.g. SIMULATED_BROWSER_PAGELATENCYMS."""
+        overrides = {}
+        for field_name in cls.model_fields:
+            value = os.getenv(f"{SIMULATED_BROWSER_ENV_PREFIX}{field_name.upper()}")
+            if value is not None:
+                overrides[field_name] = value
+        return cls(**overrides)
+
+
+class SimulatedElement:
+    def __init__(self, browser: "SimulatedBrowser", index: int = 0):
+        self._browser = browser
+        self._index = index
+
+    @property
+    def text(self) -> str:
+        self._browser._simulate_command()
+        return f"Simulated text #{self._index} on {self._browser.url}"
+
+    @property
+    def value(self) -> str:
+        return self.text
+
+    def __getitem__(self, attribute: str) -> str:
+        self._browser._simulate_command()
+        job_id = self._browser._job_id(self._index)
+        if attribute == "href":
+            return f"{SimulatedBrowser.LINKEDIN_JOB_URL_PREFIX}/simulated-job-{job_id}?trk=simulated"
+        return job_id
+
+    def click(self) -> None:
+        self._browser._simulate_command()
+
+    def fill(self, value: str) -> None:
+        self._browser._simulate_command()
+
+    def find_by_css(self, css_selector: str, wait_time: Optional[int] = None) -> ElementList:
+        self._browser._simulate_command()
+        return ElementList([SimulatedElement(self._browser, self._index)], find_by="css", query=css_selector)
+
+    def find_by_xpath(self, xpath: str, wait_time: Optional[int] = None) -> ElementList:
+        self._browser._simulate_command()
+        return ElementList([SimulatedElement(self._browser, self._index)], find_by="xpath", query=xpath)
+
+
+class SimulatedCookieManager:
+    def __init__(self, browser: "SimulatedBrowser"):
+        self._browser = browser
+        self._cookies: Dict[str, dict] = {}
+
+    def add(self, cookie: dict, **kwargs) -> None:
+        self._browser._simulate_command()
+        for name, value in cookie.items():
+            self._cookies[name] = {"name": name, "value": value, **kwargs}
+
+    def delete(self, *cookies) -> None:
+        for name in cookies:
+            self._cookies.pop(name, None)
+
+    def delete_all(self) -> None:
+        self._cookies.clear()
+
+    def all(self, verbose: bool = False):
+        self._browser._simulate_command()
+        if verbose:
+            return list(self._cookies.values())
+        return {name: cookie["value"] for name, cookie in self._cookies.items()}
+
+
+class SimulatedBrowser:
+    """
+    In-process stand-in for the splinter Browser, used to load-test the service without Chrome and LinkedIn.
+    Pages are synthetic: search pages list jobsPerPage job cards for searchPages pages, any other
+    selector matches a single element, and elements waited on to disappear are always gone.
+    """
+
+    LINKEDIN_SEARCH_URL = "https://www.linkedin.com/jobs/search/"
+    LINKEDIN_JOB_URL_PREFIX = "https://www.linkedin.com/jobs/view"
+    REDIRECTS = {
+        "https://www.linkedin.com/in/me/": "https://www.linkedin.com/in/simulated-user/",
+    }
+    RATE_LIMITED_HTML = "<html><body><h1>HTTP ERROR 429</h1></body></html>"
+    INDEXED_QUERY_PATTERN = re.compile(r"\[(\d+)\]$")
+
+    def __init__(self, options: SimulatedBrowserOptions):
+        self.options = options
+        self.wait_time = 2
+        self.cookies = SimulatedCookieManager(self)
+        self._url = "about:blank"
+        self._rate_limited = False
+        self._random = random.Random()
+        # Touch every byte so the footprint shows up in process RSS
+        self._memory_ballast = bytearray(b"\x01") * (options.memoryFootprintMb * 1024 * 1024)
+
+    @property
+    def url(self) -> str:
+        self._simulate_command()
+        return self._url
+
+    @property
+    def title(self) -> str:
+        self._simulate_command()
+        return f"Simulated page {self._url}"
+
+    @property
+    def html(self) -> str:
+        self._simulate_command()
+        if self._rate_limited:
+            return self.RATE_LIMITED_HTML
+        return f"<html><head><title>{self._url}</title></head><body>Simulated page</body></html>"
+
+    def visit(self, url: str) -> None:
+        time.sleep(self.options.pageLatencyMs / 1000)
+        self._url = self.REDIRECTS.get(url, url)
+        self._rate_limited = self._random.random() < self.options.rateLimitRatio
+
+    def reload(self) -> None:
+        self.visit(self._url)
+
+    def execute_script(self, script: str, *args):
+        self._simulate_command()
+
+    def evaluate_script(self, script: str, *args):
+        self._simulate_command()
+
+    def find_by_css(self, css_selector: str, wait_time: Optional[int] = None) -> ElementList:
+        return self._find(css_selector, "css")
+
+    def find_by_xpath(self, xpath: str, wait_time: Optional[int] = None) -> ElementList:
+        return self._find(xpath, "xpath")
+
+    def is_element_present_by_css(self, css_selector: str, wait_time: Optional[int] = None) -> bool:
+        return not self.find_by_css(css_selector).is_empty()
+
+    def is_element_present_by_xpath(self, xpath: str, wait_time: Optional[int] = None) -> bool:
+        return not self.find_by_xpath(xpath).is_empty()
+
+    def is_element_not_present_by_css(self, css_selector: str, wait_time: Optional[int] = None) -> bool:
+        self._simulate_command()
+        return True
+
+    def is_element_not_present_by_xpath(self, xpath: str, wait_time: Optional[int] = None) -> bool:
+        self._simulate_command()
+        return True
+
+    def quit(self) -> None:
+        self._memory_ballast = bytearray()
+
+    def _find(self, query: str, find_by: str) -> ElementList:
+        self._simulate_command()
+        elements = [SimulatedElement(self, index) for index in self._matching_indexes(query)]
+        return ElementList(elements, find_by=find_by, query=query)
+
+    def _matching_indexes(self, query: str) -> List[int]:
+        if self._rate_limited:
+            return []
+        if not self._url.startswith(self.LINKEDIN_SEARCH_URL):
+            return [0]
+
+        jobs_on_page = self._jobs_on_current_page()
+        indexed_query = self.INDEXED_QUERY_PATTERN.search(query)
+        if indexed_query:
+            index = int(indexed_query.group(1))
+            return [index] if index <= jobs_on_page else []
+        return list(range(1, jobs_on_page + 1))
+
+    def _jobs_on_current_page(self) -> int:
+        start = int(parse_qs(urlparse(self._url).query).get("start", ["0"])[0])
+        if start >= self.options.jobsPerPage * self.options.searchPages:
+            return 0
+        return self.options.jobsPerPage
+
+    def _job_id(self, index: int) -> str:
+        # Stable 10 digit id per page and card, as LinkedIn job ids
+        return str(1000000000 + abs(hash((self._url, index))) % 9000000000)
+
+    def _simulate_command(self) -> None:
+        if self.options.commandLatencyMs:
+            time.sleep(self.options.commandLatencyMs / 1000)
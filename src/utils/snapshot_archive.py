@@ -0,0 +1,95 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Iterator, Optional
+
+import zstandard
+from pydantic import BaseModel
+
+
+class SnapshotEntry(BaseModel):
+    jobId: str
+    url: str
+    digest: str
+    dashboard: str = "LINKEDIN"
+    authorizedUser: bool = False
+    capturedAt: float
+
+
+class SnapshotArchive:
+    """
+    Content-addressed on-disk archive of zstd-compressed page HTML.
+    Snapshots live under objects/<digest[:2]>/<digest>.html.zst, index.jsonl maps job ids to digests.
+    """
+
+    INDEX_FILE = "index.jsonl"
+    OBJECTS_DIR = "objects"
+    COMPRESSION_LEVEL = 10
+
+    _index_lock = threading.Lock()
+
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+        os.makedirs(os.path.join(root_dir, self.OBJECTS_DIR), exist_ok=True)
+
+    @classmethod
+    def from_env(cls) -> Optional["SnapshotArchive"]:
+        root_dir = os.getenv("SNAPSHOT_ARCHIVE_DIR")
+        return cls(root_dir) if root_dir else None
+
+    def store(self, job_id: str, url: str, html: str, dashboard: str = "LINKEDIN",
+              authorized_user: bool = False) -> SnapshotEntry:
+        content = html.encode("utf-8")
+        digest = hashlib.sha256(content).hexdigest()
+        object_path = self.object_path(digest)
+        if not os.path.exists(object_path):
+            self._write_object(object_path, zstandard.ZstdCompressor(level=self.COMPRESSION_LEVEL).compress(content))
+
+        entry = SnapshotEntry(
+            jobId=job_id, url=url, digest=digest, dashboard=dashboard,
+            authorizedUser=authorized_user, capturedAt=time.time(),
+        )
+        with self._index_lock, open(os.path.join(self.root_dir, self.INDEX_FILE), "a") as f:
+            f.write(entry.model_dump_json() + "\n")
+        return entry
+
+    def load(self, digest: str) -> str:
+        with open(self.object_path(digest), "rb") as f:
+            return zstandard.ZstdDecompressor().decompress(f.read()).decode("utf-8")
+
+    def load_latest(self, job_id: str) -> str:
+        entry = self.latest_entries().get(job_id)
+        if entry is None:
+            raise KeyError(f"No snapshot archived for job {job_id}")
+        return self.load(entry.digest)
+
+    def latest_entries(self) -> Dict[str, SnapshotEntry]:
+        return {entry.jobId: entry for entry in self.iter_index()}
+
+    def iter_index(self) -> Iterator[SnapshotEntry]:
+        index_path = os.path.join(self.root_dir, self.INDEX_FILE)
+        if not os.path.exists(index_path):
+            return
+        with open(index_path) as f:
+            for line in f:
+                if line.strip():
+                    yield SnapshotEntry(**json.loads(line))
+
+    def object_path(self, digest: str) -> str:
+        return os.path.join(self.root_dir, self.OBJECTS_DIR, digest[:2], f"{digest}.html.zst")
+
+    @staticmethod
+    def _write_object(object_path: str, compressed: bytes) -> None:
+        # Write to a temp file and rename so readers never see partial snapshots
+        os.makedirs(os.path.dirname(object_path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(object_path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(compressed)
+            os.replace(temp_path, object_path)
+        except Exception:
+            os.unlink(temp_path)
+            raise